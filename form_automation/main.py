@@ -4,14 +4,30 @@ Google Form Automation - Enterprise Grade
 Production-ready automation with enterprise best practices
 """
 
+from __future__ import annotations
+
+import argparse
+import json
 import logging
 import os
+import re
 import shutil
+import signal
+import socket
+import sqlite3
 import subprocess
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
 from datetime import datetime
+from decimal import Decimal, InvalidOperation
 from pathlib import Path
-from typing import List
-from playwright.sync_api import Page, sync_playwright, TimeoutError as PlaywrightTimeoutError
+from typing import TYPE_CHECKING, Callable, Dict, List, NamedTuple, Optional
+
+if TYPE_CHECKING:
+    # Playwright is imported lazily so preflight checks run without loading it
+    from playwright.sync_api import Page
 
 
 # ==================== Configuration ====================
@@ -43,6 +59,16 @@ class Config:
         '2500',
     ]
     
+    # Preflight validation rules
+    REQUIRED_FIELDS = FIELD_NAMES
+    EMAIL_PATTERN = r'^[^@\s]+@[^@\s]+\.[A-Za-z]{2,}$'
+    CNIC_PATTERN = r'^\d{5}-\d{7}-\d$'
+    DATE_FORMAT = '%Y-%m-%d'
+    # Amount Claimed may not exceed Assigned Limit x this rate (1 when the limit is
+    # itself an amount); None skips the ceiling check
+    AMOUNT_PER_LIMIT_UNIT = None
+    MAX_UPLOAD_FILE_MB = 10
+    
     # Selectors
     SEL_FORM_INPUTS = 'input:visible, textarea:visible'
     SEL_ADD_FILE = '[role="button"]:has-text("Add file")'
@@ -71,7 +97,27 @@ class Config:
     
     # Browser settings
     KEEP_BROWSER_OPEN = True
+    HEADLESS = False
     NOTIFICATION_TITLE = "Action Required: Solve CAPTCHA"
+
+    # Worker queue settings (seconds unless noted)
+    QUEUE_BACKEND = "sqlite"  # "sqlite" (single host) or "redis" (multi host)
+    QUEUE_DB_PATH = BROWSER_DATA_DIR / "jobs.db"
+    QUEUE_REDIS_URL = "redis://localhost:6379/0"
+    QUEUE_REDIS_PREFIX = "form_automation"
+    WORKER_PROFILE_DIR = BROWSER_DATA_DIR / "profiles"
+    LEASE_SECONDS = 90
+    HEARTBEAT_INTERVAL = 20
+    WORKER_POLL_INTERVAL = 5
+    MAX_JOB_ATTEMPTS = 3
+    THROUGHPUT_REPORT_INTERVAL = 60
+    
+    # Failure-only tracing: a trace is kept only for failed or slow jobs
+    TRACE_ENABLED = False
+    TRACE_DIR = BROWSER_DATA_DIR / "traces"
+    TRACE_SLOW_JOB_SECONDS = 180
+    TRACE_MAX_FILES = 20
+    TRACE_MAX_TOTAL_MB = 200
     
     # Success messages
     SUCCESS_MESSAGES = [
@@ -157,19 +203,20 @@ def notify_user(message: str) -> None:
         # Best-effort; logging already covers visibility
         pass
 
-def get_files_from_folder() -> List[str]:
+def get_files_from_folder(folder: Optional[Path] = None) -> List[str]:
     """Get supported files with enterprise error handling"""
     logger = logging.getLogger(__name__)
-    logger.info(f"Scanning upload directory: {Config.UPLOAD_FOLDER_PATH}")
+    folder = Path(folder) if folder else Config.UPLOAD_FOLDER_PATH
+    logger.info(f"Scanning upload directory: {folder}")
     
-    if not Config.UPLOAD_FOLDER_PATH.exists():
-        logger.error(f"Upload directory not found: {Config.UPLOAD_FOLDER_PATH}")
+    if not folder.exists():
+        logger.error(f"Upload directory not found: {folder}")
         return []
     
     files = []
     try:
-        for filename in os.listdir(Config.UPLOAD_FOLDER_PATH):
-            file_path = Config.UPLOAD_FOLDER_PATH / filename
+        for filename in os.listdir(folder):
+            file_path = folder / filename
             if file_path.is_file() and file_path.suffix.lower() in Config.SUPPORTED_EXTENSIONS:
                 files.append(str(file_path))
                 logger.debug(f"File discovered: {filename}")
@@ -182,14 +229,103 @@ def get_files_from_folder() -> List[str]:
         return []
 
 
+# ==================== Preflight Validation ====================
+def validate_form_data(form_data: List[str]) -> List[str]:
+    """Check field values against the per-field rules; returns the problems found"""
+    if len(form_data) != len(Config.FIELD_NAMES):
+        return [f"Expected {len(Config.FIELD_NAMES)} form values, got {len(form_data)}"]
+    
+    values = {name: str(value).strip() for name, value in zip(Config.FIELD_NAMES, form_data)}
+    errors = [f"{name}: required field is empty" for name in Config.REQUIRED_FIELDS if not values.get(name)]
+    
+    email = values.get('Email')
+    if email and not re.match(Config.EMAIL_PATTERN, email):
+        errors.append(f"Email: '{email}' is not a valid email address")
+    
+    date = values.get('Date')
+    if date:
+        try:
+            # strptime accepts unpadded values like 2026-1-1; require the exact form
+            valid_date = datetime.strptime(date, Config.DATE_FORMAT).strftime(Config.DATE_FORMAT) == date
+        except ValueError:
+            valid_date = False
+        if not valid_date:
+            errors.append(f"Date: '{date}' does not match format {Config.DATE_FORMAT}")
+    
+    cnic = values.get('CNIC')
+    if cnic and not re.match(Config.CNIC_PATTERN, cnic):
+        errors.append(f"CNIC: '{cnic}' does not match 12345-1234567-1")
+    
+    amounts = {}
+    for name in ('Assigned Limit', 'Amount Claimed'):
+        raw = values.get(name)
+        if not raw:
+            continue
+        try:
+            amount = Decimal(raw)
+        except InvalidOperation:
+            errors.append(f"{name}: '{raw}' is not a number")
+            continue
+        if not amount.is_finite() or amount <= 0:
+            errors.append(f"{name}: '{raw}' must be a positive number")
+            continue
+        amounts[name] = amount
+    
+    if len(amounts) == 2 and Config.AMOUNT_PER_LIMIT_UNIT is not None:
+        ceiling = amounts['Assigned Limit'] * Decimal(str(Config.AMOUNT_PER_LIMIT_UNIT))
+        if amounts['Amount Claimed'] > ceiling:
+            errors.append(f"Amount Claimed: {amounts['Amount Claimed']} exceeds the assigned limit ({ceiling})")
+    
+    return errors
+
+
+def validate_upload_folder(folder: Path) -> List[str]:
+    """Check that the upload folder holds uploadable files; returns the problems found"""
+    folder = Path(folder)
+    if not folder.is_dir():
+        return [f"Upload folder not found: {folder}"]
+    
+    files = get_files_from_folder(folder)
+    if not files:
+        return [f"Upload folder has no {', '.join(Config.SUPPORTED_EXTENSIONS)} files: {folder}"]
+    
+    errors = []
+    max_bytes = Config.MAX_UPLOAD_FILE_MB * 1024 * 1024
+    for file in files:
+        path = Path(file)
+        try:
+            size = path.stat().st_size
+            readable = os.access(path, os.R_OK)
+        except OSError:
+            # Deleted or replaced since the folder was listed
+            size, readable = None, False
+        if not readable:
+            errors.append(f"Upload file is not readable: {path.name}")
+        elif size == 0:
+            errors.append(f"Upload file is empty: {path.name}")
+        elif size > max_bytes:
+            errors.append(f"Upload file exceeds {Config.MAX_UPLOAD_FILE_MB} MB: {path.name}")
+    return errors
+
+
+def preflight_job(payload: Dict) -> List[str]:
+    """Validate a job payload before any browser work; returns the problems found"""
+    return (
+        validate_form_data(payload["form_data"])
+        + validate_upload_folder(Path(payload.get("upload_folder") or Config.UPLOAD_FOLDER_PATH))
+    )
+
+
 # ==================== Core Automation Functions ====================
-def load_form(page: Page) -> bool:
+def load_form(page: Page, form_url: Optional[str] = None) -> bool:
     """Load form with enterprise error handling"""
+    from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+    
     logger = logging.getLogger(__name__)
     logger.info("Initializing form load process")
     
     try:
-        page.goto(Config.FORM_URL, timeout=Config.TIMEOUT_FORM_LOAD)
+        page.goto(form_url or Config.FORM_URL, timeout=Config.TIMEOUT_FORM_LOAD)
         page.wait_for_load_state('networkidle')
         
         # Fix UI layout issues for Google sign-in pages
@@ -344,16 +480,18 @@ def clear_form(page: Page) -> bool:
         return False
 
 
-def fill_form_fields(page: Page) -> int:
+def fill_form_fields(page: Page, form_data: Optional[List[str]] = None) -> int:
     """Fill form fields with enterprise validation"""
     logger = logging.getLogger(__name__)
     logger.info("Initiating form field population")
+    if form_data is None:
+        form_data = Config.FORM_DATA
     
     try:
         elements = page.locator(Config.SEL_FORM_INPUTS)
         filled_count = 0
         
-        for i, (field_name, field_value) in enumerate(zip(Config.FIELD_NAMES, Config.FORM_DATA)):
+        for i, (field_name, field_value) in enumerate(zip(Config.FIELD_NAMES, form_data)):
             if i < elements.count():
                 try:
                     field = elements.nth(i)
@@ -365,7 +503,7 @@ def fill_form_fields(page: Page) -> int:
                 except Exception as e:
                     logger.warning(f"Field population failed: {field_name} - {e}")
         
-        logger.info(f"Form field population complete: {filled_count}/{len(Config.FORM_DATA)} fields")
+        logger.info(f"Form field population complete: {filled_count}/{len(form_data)} fields")
         return filled_count
         
     except Exception as e:
@@ -610,102 +748,970 @@ def submit_form(page: Page) -> bool:
     return False
 
 
+# ==================== Browser Session ====================
+def launch_browser_context(playwright, user_data_dir: Path):
+    """Launch a persistent Chromium context rooted at user_data_dir"""
+    user_data_dir.mkdir(parents=True, exist_ok=True)
+    return playwright.chromium.launch_persistent_context(
+        user_data_dir=str(user_data_dir),
+        headless=Config.HEADLESS,
+        args=[
+            '--no-sandbox',
+            '--disable-dev-shm-usage',
+            '--disable-blink-features=AutomationControlled',
+            '--disable-features=IsolateOrigins,site-per-process',
+            '--disable-site-isolation-trials',
+            '--start-maximized',
+            '--window-size=1920,1080'
+        ],
+        ignore_https_errors=True,
+        viewport=None,  # Use actual window size instead of fixed viewport
+        user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+        locale='en-US',
+        timezone_id='America/New_York'
+    )
+
+
+def open_page(context) -> Page:
+    """Open a new page with automation indicators hidden"""
+    page = context.new_page()
+    
+    # Hide automation indicators (execute before navigation)
+    page.add_init_script("""
+        Object.defineProperty(navigator, 'webdriver', {
+            get: () => undefined
+        });
+        
+        // Remove automation flags
+        delete navigator.__proto__.webdriver;
+        
+        // Override plugins to look like a real browser
+        Object.defineProperty(navigator, 'plugins', {
+            get: () => [1, 2, 3, 4, 5]
+        });
+        
+        // Override languages
+        Object.defineProperty(navigator, 'languages', {
+            get: () => ['en-US', 'en']
+        });
+        
+        // Override permissions
+        const originalQuery = window.navigator.permissions.query;
+        window.navigator.permissions.query = (parameters) => (
+            parameters.name === 'notifications' ?
+                Promise.resolve({ state: Notification.permission }) :
+                originalQuery(parameters)
+        );
+    """)
+    return page
+
+
+def prune_traces(keep: Optional[Path] = None) -> None:
+    """Delete the oldest retained traces beyond TRACE_MAX_FILES / TRACE_MAX_TOTAL_MB.
+
+    The keep trace (the one just saved) is never evicted, even when it alone
+    exceeds the size cap. Workers on one host share TRACE_DIR, so files that
+    vanish mid-scan because another worker pruned them are skipped.
+    """
+    logger = logging.getLogger(__name__)
+    max_bytes = Config.TRACE_MAX_TOTAL_MB * 1024 * 1024
+    
+    traces = []
+    for path in Config.TRACE_DIR.glob("*.zip"):
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        # The kept trace sorts first so it always fits the budget
+        traces.append((path == keep, stat.st_mtime, stat.st_size, path))
+    traces.sort(key=lambda trace: trace[:2], reverse=True)
+    
+    kept_bytes = 0
+    for index, (is_kept, _, size, trace) in enumerate(traces):
+        kept_bytes += size
+        if is_kept or (index < Config.TRACE_MAX_FILES and kept_bytes <= max_bytes):
+            continue
+        try:
+            trace.unlink()
+            logger.info(f"Trace evicted: {trace.name}")
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Trace eviction failed: {trace.name} - {e}")
+
+
+class TraceRecorder:
+    """Failure-only Playwright tracing for a browser context.
+
+    Each job is traced in its own session, so at most one job is buffered at a
+    time. The trace is written as a zip archive under TRACE_DIR only when the
+    job fails or runs longer than TRACE_SLOW_JOB_SECONDS; otherwise it is
+    discarded. Tracing errors are logged and never fail the job.
+    """
+    
+    def __init__(self, context):
+        self.context = context
+        self.enabled = Config.TRACE_ENABLED
+        self.started: Optional[float] = None
+    
+    def begin(self) -> None:
+        if not self.enabled:
+            return
+        try:
+            self.context.tracing.start(screenshots=True, snapshots=True)
+            self.started = time.monotonic()
+        except Exception as e:
+            logging.getLogger(__name__).warning(f"Trace start failed: {e}")
+    
+    def end(self, name: str, success: bool) -> None:
+        if self.started is None:
+            return
+        logger = logging.getLogger(__name__)
+        duration = time.monotonic() - self.started
+        self.started = None
+        
+        try:
+            if success and duration < Config.TRACE_SLOW_JOB_SECONDS:
+                self.context.tracing.stop()
+                return
+            
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            trace_path = Config.TRACE_DIR / f"{name}_{timestamp}.zip"
+            trace_path.parent.mkdir(parents=True, exist_ok=True)
+            self.context.tracing.stop(path=str(trace_path))
+            reason = "failed" if not success else f"slow: {duration:.0f}s"
+            logger.info(f"Trace retained ({reason}): {trace_path.name}")
+            prune_traces(keep=trace_path)
+        except Exception as e:
+            logger.warning(f"Trace capture failed: {e}")
+
+
+def run_automation(page: Page, form_data: Optional[List[str]] = None,
+                   upload_folder: Optional[Path] = None, form_url: Optional[str] = None,
+                   before_submit: Optional[Callable[[], bool]] = None) -> bool:
+    """Run the load, clear, fill, upload and submit workflow for one submission.
+
+    before_submit is called right before the form is submitted; returning
+    False aborts the run without submitting.
+    """
+    logger = logging.getLogger(__name__)
+    if form_data is None:
+        form_data = Config.FORM_DATA
+    
+    if not load_form(page, form_url):
+        return False
+    
+    if not clear_form(page):
+        logger.error("Form clear operation failed")
+        return False
+    logger.info("Form clear operation successful")
+    
+    filled_count = fill_form_fields(page, form_data)
+    if filled_count != len(form_data):
+        logger.error(f"Form population incomplete: {filled_count}/{len(form_data)} fields")
+        return False
+    
+    files = get_files_from_folder(upload_folder)
+    if not (files and upload_files(page, files)):
+        logger.error("File upload operation failed")
+        return False
+    
+    if before_submit is not None and not before_submit():
+        return False
+    
+    if not submit_form(page):
+        logger.error("Form submission failed")
+        return False
+    
+    logger.info("AUTOMATION COMPLETED SUCCESSFULLY")
+    return True
+
+
+# ==================== Job Queue ====================
+class Job(NamedTuple):
+    """A job leased to a worker"""
+    job_id: str
+    payload: Dict
+    attempts: int
+
+
+class JobQueue(ABC):
+    """Shared queue of submission jobs.
+
+    Jobs move queued -> leased -> submitting -> done/failed. A worker keeps its
+    lease alive with heartbeats; when a lease expires the job is requeued, unless
+    the worker had already started submitting. Such jobs are failed for manual
+    review instead, so a form is never submitted twice.
+    """
+    
+    @abstractmethod
+    def enqueue(self, payload: Dict) -> str:
+        """Add a job and return its id"""
+    
+    @abstractmethod
+    def lease(self, worker_id: str) -> Optional[Job]:
+        """Lease the oldest queued job, recovering expired leases first"""
+    
+    @abstractmethod
+    def heartbeat(self, job_id: str, worker_id: str) -> bool:
+        """Renew a lease; False once the worker no longer owns the job"""
+    
+    @abstractmethod
+    def transition(self, job_id: str, worker_id: str, status: str, error: str = "") -> bool:
+        """Move a job owned by worker_id to status; False if it is no longer owned"""
+    
+    @abstractmethod
+    def report_worker(self, worker_id: str, stats: Dict) -> None:
+        """Publish a worker's throughput report"""
+    
+    @abstractmethod
+    def counts(self) -> Dict[str, int]:
+        """Number of jobs per status"""
+    
+    @abstractmethod
+    def workers(self) -> List[Dict]:
+        """Latest throughput report of every known worker"""
+    
+    def mark_submitting(self, job: Job, worker_id: str) -> bool:
+        return self.transition(job.job_id, worker_id, 'submitting')
+    
+    def complete(self, job: Job, worker_id: str) -> bool:
+        return self.transition(job.job_id, worker_id, 'done')
+    
+    def reject(self, job: Job, worker_id: str, error: str) -> bool:
+        """Fail a job that did not pass preflight; retrying cannot fix it"""
+        logging.getLogger(__name__).error(f"Job {job.job_id} rejected by preflight: {error}")
+        return self.transition(job.job_id, worker_id, 'failed', error)
+    
+    def fail(self, job: Job, worker_id: str, error: str, submitting: bool = False) -> bool:
+        """Requeue a failed job, or fail it for good once retrying is unsafe or exhausted"""
+        logger = logging.getLogger(__name__)
+        if not submitting and job.attempts < Config.MAX_JOB_ATTEMPTS:
+            logger.warning(f"Job {job.job_id} failed ({error}) - requeued for retry")
+            return self.transition(job.job_id, worker_id, 'queued', error)
+        logger.error(f"Job {job.job_id} failed permanently: {error}")
+        return self.transition(job.job_id, worker_id, 'failed', error)
+
+
+class SQLiteJobQueue(JobQueue):
+    """Job queue in a SQLite database running in WAL mode.
+
+    WAL lets many worker processes on one host lease jobs concurrently. The
+    database must sit on a local disk; use the Redis backend for workers
+    spread over several machines.
+    """
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            payload TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'queued',
+            worker_id TEXT,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            lease_expires REAL,
+            last_error TEXT,
+            created_at REAL NOT NULL,
+            updated_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, id);
+        CREATE TABLE IF NOT EXISTS workers (
+            worker_id TEXT PRIMARY KEY,
+            stats TEXT NOT NULL,
+            last_seen REAL NOT NULL
+        );
+    """
+    
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(self.SCHEMA)
+        finally:
+            conn.close()
+    
+    def _connect(self) -> sqlite3.Connection:
+        # Autocommit mode; transactions are opened explicitly with BEGIN IMMEDIATE
+        return sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None)
+    
+    @contextmanager
+    def _transaction(self):
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+    
+    def _reap_expired(self, conn: sqlite3.Connection, now: float) -> None:
+        """Recover jobs whose worker stopped sending heartbeats"""
+        lost = conn.execute(
+            "UPDATE jobs SET status = 'failed', last_error = 'worker lost during submission', updated_at = ? "
+            "WHERE status = 'submitting' AND lease_expires < ?",
+            (now, now)
+        ).rowcount
+        lost += conn.execute(
+            "UPDATE jobs SET status = 'failed', last_error = 'worker lost; attempts exhausted', updated_at = ? "
+            "WHERE status = 'leased' AND lease_expires < ? AND attempts >= ?",
+            (now, now, Config.MAX_JOB_ATTEMPTS)
+        ).rowcount
+        requeued = conn.execute(
+            "UPDATE jobs SET status = 'queued', worker_id = NULL, updated_at = ? "
+            "WHERE status = 'leased' AND lease_expires < ?",
+            (now, now)
+        ).rowcount
+        if lost or requeued:
+            logging.getLogger(__name__).warning(
+                f"Expired leases recovered: {requeued} requeued, {lost} failed"
+            )
+    
+    def enqueue(self, payload: Dict) -> str:
+        now = time.time()
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "INSERT INTO jobs (payload, created_at, updated_at) VALUES (?, ?, ?)",
+                (json.dumps(payload), now, now)
+            )
+            return str(cursor.lastrowid)
+    
+    def lease(self, worker_id: str) -> Optional[Job]:
+        now = time.time()
+        with self._transaction() as conn:
+            self._reap_expired(conn, now)
+            row = conn.execute(
+                "SELECT id, payload, attempts FROM jobs WHERE status = 'queued' ORDER BY id LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return None
+            job_id, payload, attempts = row[0], row[1], row[2] + 1
+            conn.execute(
+                "UPDATE jobs SET status = 'leased', worker_id = ?, attempts = ?, lease_expires = ?, updated_at = ? "
+                "WHERE id = ?",
+                (worker_id, attempts, now + Config.LEASE_SECONDS, now, job_id)
+            )
+        return Job(str(job_id), json.loads(payload), attempts)
+    
+    def heartbeat(self, job_id: str, worker_id: str) -> bool:
+        now = time.time()
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET lease_expires = ?, updated_at = ? "
+                "WHERE id = ? AND worker_id = ? AND status IN ('leased', 'submitting')",
+                (now + Config.LEASE_SECONDS, now, int(job_id), worker_id)
+            )
+            return cursor.rowcount == 1
+    
+    def transition(self, job_id: str, worker_id: str, status: str, error: str = "") -> bool:
+        now = time.time()
+        submitting = status == 'submitting'
+        with self._transaction() as conn:
+            # Only a live lease may start submitting; the claim also renews it
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, last_error = ?, updated_at = ?, "
+                "worker_id = CASE WHEN ? = 'queued' THEN NULL ELSE worker_id END, "
+                "lease_expires = CASE WHEN ? THEN ? ELSE lease_expires END "
+                "WHERE id = ? AND worker_id = ? AND status IN ('leased', 'submitting') "
+                "AND (NOT ? OR lease_expires >= ?)",
+                (status, error, now, status, submitting, now + Config.LEASE_SECONDS,
+                 int(job_id), worker_id, submitting, now)
+            )
+            return cursor.rowcount == 1
+    
+    def report_worker(self, worker_id: str, stats: Dict) -> None:
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO workers (worker_id, stats, last_seen) VALUES (?, ?, ?)",
+                (worker_id, json.dumps(stats), time.time())
+            )
+    
+    def counts(self) -> Dict[str, int]:
+        conn = self._connect()
+        try:
+            rows = conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        finally:
+            conn.close()
+        return {status: count for status, count in rows}
+    
+    def workers(self) -> List[Dict]:
+        conn = self._connect()
+        try:
+            rows = conn.execute("SELECT worker_id, stats, last_seen FROM workers ORDER BY worker_id").fetchall()
+        finally:
+            conn.close()
+        return [
+            dict(json.loads(stats), worker_id=worker_id, last_seen=datetime.fromtimestamp(last_seen).isoformat())
+            for worker_id, stats, last_seen in rows
+        ]
+
+
+class RedisJobQueue(JobQueue):
+    """Job queue on a Redis-compatible server, for workers on several hosts.
+
+    Every state change runs as a Lua script so leases stay atomic across
+    workers. Requires the optional `redis` package.
+    """
+    
+    # KEYS: queue list, lease zset. ARGV: key prefix, worker id, now, lease seconds, max attempts
+    LEASE_SCRIPT = """
+        local queue, leases = KEYS[1], KEYS[2]
+        local prefix, worker = ARGV[1], ARGV[2]
+        local now, lease_seconds, max_attempts = tonumber(ARGV[3]), tonumber(ARGV[4]), tonumber(ARGV[5])
+        for _, id in ipairs(redis.call('ZRANGEBYSCORE', leases, '-inf', now)) do
+            local key = prefix .. ':job:' .. id
+            redis.call('ZREM', leases, id)
+            if redis.call('HGET', key, 'status') == 'submitting' then
+                redis.call('HSET', key, 'status', 'failed', 'last_error', 'worker lost during submission', 'updated_at', now)
+            elseif tonumber(redis.call('HGET', key, 'attempts') or '0') >= max_attempts then
+                redis.call('HSET', key, 'status', 'failed', 'last_error', 'worker lost; attempts exhausted', 'updated_at', now)
+            else
+                redis.call('HSET', key, 'status', 'queued', 'worker_id', '', 'updated_at', now)
+                redis.call('RPUSH', queue, id)
+            end
+        end
+        local id = redis.call('RPOP', queue)
+        if not id then
+            return false
+        end
+        local key = prefix .. ':job:' .. id
+        local attempts = redis.call('HINCRBY', key, 'attempts', 1)
+        redis.call('HSET', key, 'status', 'leased', 'worker_id', worker,
+                   'lease_expires', now + lease_seconds, 'updated_at', now)
+        redis.call('ZADD', leases, now + lease_seconds, id)
+        return {id, redis.call('HGET', key, 'payload'), attempts}
+    """
+    
+    # KEYS: job hash, lease zset. ARGV: job id, worker id, new expiry
+    HEARTBEAT_SCRIPT = """
+        local key, leases = KEYS[1], KEYS[2]
+        local status = redis.call('HGET', key, 'status')
+        if redis.call('HGET', key, 'worker_id') ~= ARGV[2] or (status ~= 'leased' and status ~= 'submitting') then
+            return 0
+        end
+        redis.call('HSET', key, 'lease_expires', ARGV[3])
+        redis.call('ZADD', leases, ARGV[3], ARGV[1])
+        return 1
+    """
+    
+    # KEYS: job hash, lease zset, queue list. ARGV: job id, worker id, new status, error, now, lease seconds
+    TRANSITION_SCRIPT = """
+        local key, leases, queue = KEYS[1], KEYS[2], KEYS[3]
+        local job_id, worker, status = ARGV[1], ARGV[2], ARGV[3]
+        local now = tonumber(ARGV[5])
+        local current = redis.call('HGET', key, 'status')
+        if redis.call('HGET', key, 'worker_id') ~= worker or (current ~= 'leased' and current ~= 'submitting') then
+            return 0
+        end
+        if status == 'submitting' then
+            -- Only a live lease may start submitting; the claim renews it
+            if tonumber(redis.call('HGET', key, 'lease_expires') or '0') < now then
+                return 0
+            end
+            local expires = now + tonumber(ARGV[6])
+            redis.call('HSET', key, 'lease_expires', expires)
+            redis.call('ZADD', leases, expires, job_id)
+        else
+            redis.call('ZREM', leases, job_id)
+        end
+        redis.call('HSET', key, 'status', status, 'last_error', ARGV[4], 'updated_at', now)
+        if status == 'queued' then
+            redis.call('HSET', key, 'worker_id', '')
+            redis.call('RPUSH', queue, job_id)
+        end
+        return 1
+    """
+    
+    def __init__(self, url: str, prefix: str = Config.QUEUE_REDIS_PREFIX):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("Redis queue backend requires the 'redis' package (pip3 install redis)") from e
+        
+        self.client = redis.Redis.from_url(url, decode_responses=True)
+        self.prefix = prefix
+        self._lease = self.client.register_script(self.LEASE_SCRIPT)
+        self._heartbeat = self.client.register_script(self.HEARTBEAT_SCRIPT)
+        self._transition = self.client.register_script(self.TRANSITION_SCRIPT)
+    
+    def _key(self, *parts: str) -> str:
+        return ":".join((self.prefix,) + parts)
+    
+    def enqueue(self, payload: Dict) -> str:
+        job_id = str(self.client.incr(self._key("next_id")))
+        now = time.time()
+        pipe = self.client.pipeline()
+        pipe.hset(self._key("job", job_id), mapping={
+            "payload": json.dumps(payload),
+            "status": "queued",
+            "attempts": 0,
+            "created_at": now,
+            "updated_at": now,
+        })
+        pipe.lpush(self._key("queue"), job_id)
+        pipe.execute()
+        return job_id
+    
+    def lease(self, worker_id: str) -> Optional[Job]:
+        result = self._lease(
+            keys=[self._key("queue"), self._key("leases")],
+            args=[self.prefix, worker_id, time.time(), Config.LEASE_SECONDS, Config.MAX_JOB_ATTEMPTS]
+        )
+        if not result:
+            return None
+        job_id, payload, attempts = result
+        return Job(str(job_id), json.loads(payload), int(attempts))
+    
+    def heartbeat(self, job_id: str, worker_id: str) -> bool:
+        return bool(self._heartbeat(
+            keys=[self._key("job", job_id), self._key("leases")],
+            args=[job_id, worker_id, time.time() + Config.LEASE_SECONDS]
+        ))
+    
+    def transition(self, job_id: str, worker_id: str, status: str, error: str = "") -> bool:
+        return bool(self._transition(
+            keys=[self._key("job", job_id), self._key("leases"), self._key("queue")],
+            args=[job_id, worker_id, status, error, time.time(), Config.LEASE_SECONDS]
+        ))
+    
+    def report_worker(self, worker_id: str, stats: Dict) -> None:
+        key = self._key("worker", worker_id)
+        pipe = self.client.pipeline()
+        pipe.set(key, json.dumps(dict(stats, last_seen=datetime.now().isoformat())), ex=86400)
+        pipe.sadd(self._key("workers"), worker_id)
+        pipe.execute()
+    
+    def counts(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for key in self.client.scan_iter(match=self._key("job", "*")):
+            status = self.client.hget(key, "status")
+            if status:
+                counts[status] = counts.get(status, 0) + 1
+        return counts
+    
+    def workers(self) -> List[Dict]:
+        workers = []
+        for worker_id in sorted(self.client.smembers(self._key("workers"))):
+            stats = self.client.get(self._key("worker", worker_id))
+            if stats is None:
+                # Report expired; the worker has been gone for a day
+                self.client.srem(self._key("workers"), worker_id)
+                continue
+            workers.append(dict(json.loads(stats), worker_id=worker_id))
+        return workers
+
+
+def create_job_queue(backend: str, db_path: Path, redis_url: str) -> JobQueue:
+    """Instantiate the configured queue backend"""
+    if backend == "redis":
+        return RedisJobQueue(redis_url)
+    return SQLiteJobQueue(db_path)
+
+
+def build_job_payload(raw: Dict) -> Dict:
+    """Normalize a job description into the payload stored on the queue.
+
+    form_data may be a list in FIELD_NAMES order or a mapping keyed by field
+    name. Jobs belong to different people, so nothing falls back to
+    Config.FORM_DATA: every field except Date (which defaults to today) and
+    the upload folder must be given.
+    """
+    form_data = raw.get("form_data")
+    if not form_data:
+        raise ValueError("Job has no form_data")
+    if not raw.get("upload_folder"):
+        raise ValueError("Job has no upload_folder")
+    
+    if isinstance(form_data, dict):
+        unknown = set(form_data) - set(Config.FIELD_NAMES)
+        if unknown:
+            raise ValueError(f"Unknown form fields: {', '.join(sorted(unknown))}")
+        # A JSON null is missing, not the text "None"; Date may only be left out entirely
+        missing = [
+            name for name in Config.FIELD_NAMES
+            if (name in form_data and form_data[name] is None) or (name != 'Date' and name not in form_data)
+        ]
+        if missing:
+            raise ValueError(f"Missing form fields: {', '.join(missing)}")
+        defaults = {'Date': datetime.now().strftime(Config.DATE_FORMAT)}
+        values = [str(form_data.get(name, defaults.get(name))) for name in Config.FIELD_NAMES]
+    else:
+        if len(form_data) != len(Config.FIELD_NAMES):
+            raise ValueError(f"Expected {len(Config.FIELD_NAMES)} form values, got {len(form_data)}")
+        # None becomes empty so preflight reports the field as required
+        values = ["" if value is None else str(value) for value in form_data]
+    
+    return {
+        "form_data": values,
+        "upload_folder": str(raw["upload_folder"]),
+        "form_url": raw.get("form_url") or Config.FORM_URL,
+    }
+
+
+def default_job() -> Dict:
+    """Job description for a single run of Config.FORM_DATA"""
+    return {"form_data": Config.FORM_DATA, "upload_folder": Config.UPLOAD_FOLDER_PATH}
+
+
+def load_jobs_file(path: Path) -> List[Dict]:
+    """Read job descriptions from a JSON array or a JSON Lines file"""
+    text = path.read_text(encoding="utf-8").strip()
+    if text.startswith("["):
+        return json.loads(text)
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+def preflight_jobs(raw_jobs: List[Dict]) -> List[Dict]:
+    """Build and validate job payloads, logging and dropping the invalid ones"""
+    logger = logging.getLogger(__name__)
+    valid = []
+    for index, raw in enumerate(raw_jobs, start=1):
+        try:
+            payload = build_job_payload(raw)
+        except (ValueError, TypeError, AttributeError) as e:
+            errors = [str(e)]
+        else:
+            errors = preflight_job(payload)
+        
+        if errors:
+            for error in errors:
+                logger.error(f"Job {index} rejected: {error}")
+        else:
+            valid.append(payload)
+    
+    logger.info(f"Preflight complete: {len(valid)}/{len(raw_jobs)} jobs valid")
+    return valid
+
+
+def enqueue_jobs(queue: JobQueue, path: Path) -> int:
+    """Add every job in path that passes preflight to the queue; returns the number enqueued"""
+    logger = logging.getLogger(__name__)
+    payloads = preflight_jobs(load_jobs_file(path))
+    for payload in payloads:
+        job_id = queue.enqueue(payload)
+        logger.info(f"Job enqueued as {job_id}")
+    
+    logger.info(f"Enqueue complete: {len(payloads)} jobs added from {path}")
+    return len(payloads)
+
+
+def log_queue_status(queue: JobQueue) -> None:
+    """Log job counts per status and each worker's last throughput report"""
+    logger = logging.getLogger(__name__)
+    counts = queue.counts()
+    summary = ", ".join(f"{status}={counts.get(status, 0)}" for status in ('queued', 'leased', 'submitting', 'done', 'failed'))
+    logger.info(f"Queue status: {summary}")
+    for worker in queue.workers():
+        logger.info(
+            f"Worker {worker['worker_id']}: {worker['jobs_done']} done, {worker['jobs_failed']} failed, "
+            f"{worker['jobs_per_hour']} jobs/hour (last seen {worker['last_seen']})"
+        )
+
+
+# ==================== Worker Mode ====================
+class LeaseHeartbeat(threading.Thread):
+    """Background thread that keeps a job lease alive while the browser works"""
+    
+    def __init__(self, queue: JobQueue, job_id: str, worker_id: str):
+        super().__init__(name=f"heartbeat-{job_id}", daemon=True)
+        self.queue = queue
+        self.job_id = job_id
+        self.worker_id = worker_id
+        self.lost = False
+        self._stop_event = threading.Event()
+    
+    def run(self) -> None:
+        logger = logging.getLogger(__name__)
+        while not self._stop_event.wait(Config.HEARTBEAT_INTERVAL):
+            try:
+                if not self.queue.heartbeat(self.job_id, self.worker_id):
+                    logger.error(f"Lease lost for job {self.job_id}")
+                    self.lost = True
+                    return
+            except Exception as e:
+                # Transient backend errors are retried on the next beat
+                logger.warning(f"Heartbeat failed for job {self.job_id}: {e}")
+    
+    def stop(self) -> None:
+        self._stop_event.set()
+        self.join()
+
+
+class WorkerStats:
+    """Throughput counters for one worker process"""
+    
+    def __init__(self):
+        self.started = time.time()
+        self.jobs_done = 0
+        self.jobs_failed = 0
+        self.busy_seconds = 0.0
+    
+    @property
+    def jobs_total(self) -> int:
+        return self.jobs_done + self.jobs_failed
+    
+    def record(self, success: bool, duration: float) -> None:
+        if success:
+            self.jobs_done += 1
+        else:
+            self.jobs_failed += 1
+        self.busy_seconds += duration
+    
+    def as_dict(self) -> Dict:
+        elapsed_hours = max(time.time() - self.started, 1.0) / 3600
+        return {
+            "host": socket.gethostname(),
+            "pid": os.getpid(),
+            "started_at": datetime.fromtimestamp(self.started).isoformat(),
+            "jobs_done": self.jobs_done,
+            "jobs_failed": self.jobs_failed,
+            "jobs_per_hour": round(self.jobs_done / elapsed_hours, 1),
+            "avg_job_seconds": round(self.busy_seconds / self.jobs_total, 1) if self.jobs_total else 0.0,
+        }
+
+
+def report_throughput(queue: JobQueue, worker_id: str, stats: WorkerStats) -> None:
+    """Log worker throughput and publish it to the queue backend"""
+    logger = logging.getLogger(__name__)
+    report = stats.as_dict()
+    logger.info(
+        f"Worker {worker_id} throughput: {report['jobs_done']} done, {report['jobs_failed']} failed, "
+        f"{report['jobs_per_hour']} jobs/hour, {report['avg_job_seconds']}s per job"
+    )
+    try:
+        queue.report_worker(worker_id, report)
+    except Exception as e:
+        logger.warning(f"Throughput report failed: {e}")
+
+
+def process_job(page: Page, queue: JobQueue, job: Job, worker_id: str, tracer: TraceRecorder) -> bool:
+    """Run one leased job under a heartbeat and record its outcome on the queue"""
+    logger = logging.getLogger(__name__)
+    logger.info(f"Job {job.job_id} leased (attempt {job.attempts}/{Config.MAX_JOB_ATTEMPTS})")
+    
+    # Upload folders can change between enqueue and run, so check again before touching the browser
+    errors = preflight_job(job.payload)
+    if errors:
+        queue.reject(job, worker_id, "; ".join(errors))
+        return False
+    
+    heartbeat = LeaseHeartbeat(queue, job.job_id, worker_id)
+    heartbeat.start()
+    submitting = False
+    
+    def before_submit() -> bool:
+        nonlocal submitting
+        # Claim the submission; a lost lease means another worker may own the job now
+        if heartbeat.lost or not queue.mark_submitting(job, worker_id):
+            logger.error(f"Job {job.job_id} lease lost - aborting before submission")
+            return False
+        submitting = True
+        return True
+    
+    tracer.begin()
+    try:
+        success = run_automation(
+            page,
+            form_data=job.payload["form_data"],
+            upload_folder=job.payload.get("upload_folder"),
+            form_url=job.payload.get("form_url"),
+            before_submit=before_submit,
+        )
+    except BaseException as e:
+        heartbeat.stop()
+        tracer.end(f"job_{job.job_id}", success=False)
+        try:
+            queue.fail(job, worker_id, f"worker interrupted: {e!r}", submitting=submitting)
+        except Exception as queue_error:
+            logger.error(f"Could not release job {job.job_id}: {queue_error}")
+        raise
+    
+    heartbeat.stop()
+    tracer.end(f"job_{job.job_id}", success)
+    if heartbeat.lost and not submitting:
+        # The job has already been requeued for another worker
+        return False
+    
+    if success:
+        if queue.complete(job, worker_id):
+            logger.info(f"Job {job.job_id} completed")
+        else:
+            logger.warning(f"Job {job.job_id} submitted but its lease had expired - check the queue record")
+    else:
+        error = "submission not confirmed" if submitting else "automation failed"
+        queue.fail(job, worker_id, error, submitting=submitting)
+    return success
+
+
+def run_worker(queue: JobQueue, worker_id: str, profile_dir: Path,
+               max_jobs: int = 0, exit_when_empty: bool = False) -> None:
+    """Pull jobs from the shared queue until stopped, reusing one browser session"""
+    from playwright.sync_api import sync_playwright
+    
+    logger = logging.getLogger(__name__)
+    stats = WorkerStats()
+    stop_event = threading.Event()
+    
+    def request_stop(signum, frame):
+        logger.info("Shutdown requested - finishing current job")
+        stop_event.set()
+    
+    signal.signal(signal.SIGTERM, request_stop)
+    logger.info(f"Worker {worker_id} started (profile: {profile_dir})")
+    
+    with sync_playwright() as playwright:
+        context = launch_browser_context(playwright, profile_dir)
+        page = open_page(context)
+        tracer = TraceRecorder(context)
+        last_report = time.time()
+        
+        try:
+            while not stop_event.is_set():
+                job = queue.lease(worker_id)
+                if job is None:
+                    if exit_when_empty:
+                        logger.info("Queue empty - worker exiting")
+                        break
+                    stop_event.wait(Config.WORKER_POLL_INTERVAL)
+                else:
+                    started = time.time()
+                    stats.record(process_job(page, queue, job, worker_id, tracer), time.time() - started)
+                    if max_jobs and stats.jobs_total >= max_jobs:
+                        logger.info(f"Job limit reached ({max_jobs}) - worker exiting")
+                        break
+                
+                if time.time() - last_report >= Config.THROUGHPUT_REPORT_INTERVAL:
+                    report_throughput(queue, worker_id, stats)
+                    last_report = time.time()
+        finally:
+            report_throughput(queue, worker_id, stats)
+            context.close()
+            logger.info(f"Worker {worker_id} stopped")
+
+
 # ==================== Main Function ====================
-def main() -> None:
-    """Enterprise automation orchestration"""
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Google Form Automation")
+    parser.add_argument("--url", help="Google Form URL (overrides Config.FORM_URL)")
+    parser.add_argument("--headless", action="store_true", help="Run the browser without a window")
+    parser.add_argument("--check", action="store_true",
+                        help="Only run preflight validation (of the --enqueue file, or FORM_DATA) and exit")
+    parser.add_argument("--trace", action="store_true",
+                        help="Record Playwright traces, keeping only those of failed or slow jobs")
+    
+    queue_group = parser.add_argument_group("worker mode")
+    mode = queue_group.add_mutually_exclusive_group()
+    mode.add_argument("--worker", action="store_true", help="Pull submission jobs from the shared queue")
+    mode.add_argument("--enqueue", metavar="FILE", type=Path, help="Add jobs from a JSON or JSON Lines file to the queue")
+    mode.add_argument("--queue-status", action="store_true", help="Show queue counts and worker throughput")
+    queue_group.add_argument("--queue-backend", choices=["sqlite", "redis"], default=Config.QUEUE_BACKEND)
+    queue_group.add_argument("--queue-db", type=Path, default=Config.QUEUE_DB_PATH, help="SQLite queue database")
+    queue_group.add_argument("--redis-url", default=Config.QUEUE_REDIS_URL, help="Redis queue server URL")
+    queue_group.add_argument("--profile",
+                             help="Browser profile name (required with --worker); reuse it to keep the Google "
+                                  "login, but never share it between two running workers")
+    queue_group.add_argument("--max-jobs", type=int, default=0, help="Exit after this many jobs (0 = no limit)")
+    queue_group.add_argument("--exit-when-empty", action="store_true", help="Exit once the queue is drained")
+    
+    args = parser.parse_args(argv)
+    if args.check and (args.worker or args.queue_status):
+        parser.error("--check only validates FORM_DATA or an --enqueue file; it cannot be combined with "
+                     "--worker or --queue-status")
+    if args.worker:
+        # A fresh per-process profile has no Google login and would pile up on disk
+        if not args.profile:
+            parser.error("--worker requires --profile NAME (one profile per running worker)")
+        if Path(args.profile).name != args.profile or args.profile in (".", ".."):
+            parser.error(f"--profile must be a plain name, got {args.profile!r}")
+    return args
+
+
+def run_single() -> bool:
+    """Submit Config.FORM_DATA once in the main browser profile; returns True on success"""
     logger = logging.getLogger(__name__)
+    if not preflight_jobs([default_job()]):
+        logger.error("Preflight validation failed - browser not launched")
+        return False
+    
+    from playwright.sync_api import sync_playwright
+    
+    with sync_playwright() as playwright:
+        context = launch_browser_context(playwright, Config.BROWSER_DATA_DIR)
+        page = open_page(context)
+        tracer = TraceRecorder(context)
+        
+        # Automation workflow
+        tracer.begin()
+        success = False
+        try:
+            success = run_automation(page)
+        finally:
+            tracer.end("run", success)
+        
+        # Resource cleanup
+        if Config.KEEP_BROWSER_OPEN:
+            logger.info("Browser session maintained for inspection")
+        else:
+            context.close()
+            logger.info("Browser session terminated")
+    
+    return success
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Enterprise automation orchestration; returns the process exit code"""
+    logger = logging.getLogger(__name__)
+    args = parse_args(argv)
+    if args.url:
+        Config.FORM_URL = args.url
+    if args.headless:
+        Config.HEADLESS = True
+    if args.trace:
+        Config.TRACE_ENABLED = True
     setup_logging()
     
+    if args.check:
+        try:
+            raw_jobs = load_jobs_file(args.enqueue) if args.enqueue else [default_job()]
+        except (OSError, ValueError) as e:
+            logger.error(f"Preflight validation failed: cannot read job file {args.enqueue}: {e}")
+            return 1
+        return 0 if len(preflight_jobs(raw_jobs)) == len(raw_jobs) else 1
+    
+    exit_code = 0
     try:
-        with sync_playwright() as playwright:
-            context = playwright.chromium.launch_persistent_context(
-                user_data_dir=str(Config.BROWSER_DATA_DIR),
-                headless=False,
-                args=[
-                    '--no-sandbox',
-                    '--disable-dev-shm-usage',
-                    '--disable-blink-features=AutomationControlled',
-                    '--disable-features=IsolateOrigins,site-per-process',
-                    '--disable-site-isolation-trials',
-                    '--start-maximized',
-                    '--window-size=1920,1080'
-                ],
-                ignore_https_errors=True,
-                viewport=None,  # Use actual window size instead of fixed viewport
-                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                locale='en-US',
-                timezone_id='America/New_York'
-            )
-            
-            page = context.new_page()
-            
-            # Hide automation indicators (execute before navigation)
-            page.add_init_script("""
-                Object.defineProperty(navigator, 'webdriver', {
-                    get: () => undefined
-                });
-                
-                // Remove automation flags
-                delete navigator.__proto__.webdriver;
-                
-                // Override plugins to look like a real browser
-                Object.defineProperty(navigator, 'plugins', {
-                    get: () => [1, 2, 3, 4, 5]
-                });
-                
-                // Override languages
-                Object.defineProperty(navigator, 'languages', {
-                    get: () => ['en-US', 'en']
-                });
-                
-                // Override permissions
-                const originalQuery = window.navigator.permissions.query;
-                window.navigator.permissions.query = (parameters) => (
-                    parameters.name === 'notifications' ?
-                        Promise.resolve({ state: Notification.permission }) :
-                        originalQuery(parameters)
-                );
-            """)
-            
-            # Automation workflow
-            if load_form(page):
-                if clear_form(page):
-                    logger.info("Form clear operation successful")
-                    
-                    filled_count = fill_form_fields(page)
-                    
-                    if filled_count == len(Config.FORM_DATA):
-                        files = get_files_from_folder()
-                        
-                        if files and upload_files(page, files):
-                            if submit_form(page):
-                                logger.info("AUTOMATION COMPLETED SUCCESSFULLY")
-                            else:
-                                logger.error("Form submission failed")
-                        else:
-                            logger.error("File upload operation failed")
-                    else:
-                        logger.error(f"Form population incomplete: {filled_count}/{len(Config.FORM_DATA)} fields")
-                else:
-                    logger.error("Form clear operation failed")
-            
-            # Resource cleanup
-            if Config.KEEP_BROWSER_OPEN:
-                logger.info("Browser session maintained for inspection")
+        if args.worker or args.enqueue or args.queue_status:
+            queue = create_job_queue(args.queue_backend, args.queue_db, args.redis_url)
+            if args.enqueue:
+                enqueue_jobs(queue, args.enqueue)
+            elif args.queue_status:
+                log_queue_status(queue)
             else:
-                context.close()
-                logger.info("Browser session terminated")
+                worker_id = f"{socket.gethostname()}-{os.getpid()}"
+                profile_dir = Config.WORKER_PROFILE_DIR / args.profile
+                run_worker(queue, worker_id, profile_dir, args.max_jobs, args.exit_when_empty)
+        elif not run_single():
+            # Non-zero so callers such as the n8n Execute Command node see the failure
+            exit_code = 1
             
     except Exception as e:
         logger.error(f"Automation execution failed: {e}", exc_info=True)
+        exit_code = 1
     
     finally:
         logger.info("=" * 60)
         logger.info("Automation process completed")
-        if Config.KEEP_BROWSER_OPEN:
+        if Config.KEEP_BROWSER_OPEN and not (args.worker or args.enqueue or args.queue_status):
             logger.info("Browser remains active for manual inspection")
         logger.info("=" * 60)
+    
+    return exit_code
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    raise SystemExit(main())